@@ -0,0 +1,29 @@
+"""Add users active indexes
+
+Revision ID: d41e7a9c3f25
+Revises: 8b3f73d9bd58
+Create Date: 2026-10-15 09:12:41.203117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd41e7a9c3f25'
+down_revision = '8b3f73d9bd58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_users_active', 'users', ['active'], unique=False)
+    op.create_index(
+        'ix_users_active_admin', 'users', ['active', 'admin'], unique=False,
+        sqlite_where=sa.text(u"active = 'Y'"), postgresql_where=sa.text(u"active = 'Y'")
+    )
+
+
+def downgrade():
+    op.drop_index('ix_users_active_admin', table_name='users')
+    op.drop_index('ix_users_active', table_name='users')
@@ -1,7 +1,8 @@
 import sys
+from contextlib import contextmanager
 from modules.common import utils as ut
 from modules.config import Settings
-from sqlalchemy import create_engine, event
+from sqlalchemy import create_engine, event, insert, literal, select
 from sqlalchemy.orm import sessionmaker
 
 from models.application import Users
@@ -30,6 +31,8 @@ class TestApp(object):
 
     def _load_config(self, force=False):
         if self._config is None or force:
+            if force:
+                Settings.reset()
             self._config = Settings()
 
     def _create_engine(self):
@@ -38,14 +41,15 @@ class TestApp(object):
                 "Call load config before"
             )
         if self._db_engine is None:
-            self._db_engine = create_engine(
-                self._config.db.uri,
-                echo=True
-            )
+            engine_options = dict(echo=False, query_cache_size=1200)
+            engine_options.update(self._config.db.engine_options)
+            self._db_engine = create_engine(self._config.db.uri, **engine_options)
             self._logger.debug("Created Database Engine")
 
     def _log_sql(self, conn, cursor, statement, parameters, context, executemany):
-        self._logger.info(
+        if not self._logger.is_enabled_for("debug"):
+            return
+        self._logger.debug(
             "sql_query",
             statement=statement,
             parameters=parameters,
@@ -53,16 +57,40 @@ class TestApp(object):
         )
 
     def _log_sql_complete(self, conn, cursor, statement, parameters, context, executemany):
-        self._logger.info(
+        if not self._logger.is_enabled_for("debug"):
+            return
+        self._logger.debug(
             "sql_query_complete",
             statement=statement
         )
 
+    @staticmethod
+    def _set_bulk_load_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.execute("PRAGMA journal_mode=MEMORY")
+        cursor.close()
+
+    @contextmanager
+    def _sqlite_bulk_load(self):
+        """Relax SQLite durability for connections opened inside the block"""
+        if self._db_engine.dialect.name != "sqlite":
+            yield
+            return
+        event.listen(self._db_engine, "connect", self._set_bulk_load_pragmas)
+        try:
+            yield
+        finally:
+            event.remove(self._db_engine, "connect", self._set_bulk_load_pragmas)
+
     def _register_listeners(self):
         if self._db_engine is None:
             raise RuntimeError(
                 "Call create_engine before"
             )
+        if not self._config.debug:
+            # Per-statement logging is only useful while debugging
+            return
         event.listen(self._db_engine, "before_cursor_execute", self._log_sql)
         event.listen(self._db_engine, "after_cursor_execute", self._log_sql_complete)
 
@@ -139,21 +167,21 @@ class TestApp(object):
         try:
             db_fl.unlink()
             self._logger.debug(
-                "Database '{}' deleted successfully".format(db_fl)
+                "Database deleted successfully", path=str(db_fl)
             )
         except FileNotFoundError:
             self._logger.error(
-                "The database file '{}' does not exist.".format(db_fl)
+                "The database file does not exist", path=str(db_fl)
             )
         except PermissionError:
             self._logger.error(
-                "Permission denied to delete the database '{}'.".format(db_fl)
+                "Permission denied to delete the database", path=str(db_fl)
             )
 
     def teardown(self):
         self.delete_database()
 
-    def populate_users_in_db(self, count=10000, batch_size = 1000):
+    def populate_users_in_db(self, count=10000, batch_size=10000):
         """Fill-in users data in application db """
         if not self._configured:
             raise RuntimeError(
@@ -163,39 +191,45 @@ class TestApp(object):
         if batch_size > count:
             batch_size = count
 
-        with self._session_factory() as session:
-            user_count = session.query(Users).count()
-            if user_count > 0:
+        with self._sqlite_bulk_load(), self._session_factory() as session:
+            has_users = session.execute(
+                select(literal(1)).select_from(Users).limit(1)
+            ).first() is not None
+            if has_users:
                 self._logger.warning(
                     "User table is not empty. Skip initialization"
                 )
                 return
             self._logger.info(
-                "User populating: Generate {} users".format(count)
+                "User populating: Generate users", count=count
             )
 
             for i in range(0, count, batch_size):
-                users = [UserFactory.build() for _ in range(min(batch_size, count - i))]
-                session.bulk_save_objects(users)
-                session.commit()
+                rows = UserFactory.build_batch_dicts(min(batch_size, count - i))
+                session.execute(insert(Users), rows)
                 self._logger.debug(
-                    "User populating: Inserted {} users...".format(count)
+                    "User populating: Inserted users", inserted=i + len(rows)
                 )
-            self._logger.info("Successfully created {} users!".format(count))
+            session.commit()
+            self._logger.info("Successfully created users", count=count)
 
 
     def get_users(self, execution_count=1000):
         self._logger.info("=" * 40)
-        self._logger.info("Retrieving active user '' times".format(execution_count))
+        self._logger.info("Retrieving users", execution_count=execution_count)
+        iterations = range(execution_count)
         with elapsed_timer() as elapsed:
-            for _ in range(execution_count):
-                active_usrs = get_active_users(self._session_factory)
-                admin_usrs = get_admin_users(self._session_factory)
-                inactive_usrs = get_inactive_users(self._session_factory)
-            self._logger.info(
-                "Retrieved users '{}' times".format(execution_count),
-                execution_time = elapsed()
-            )
+            with self._session_factory() as session:
+                for _ in iterations:
+                    active_usrs = get_active_users(self._session_factory, session=session)
+                    admin_usrs = get_admin_users(self._session_factory, session=session)
+                    inactive_usrs = get_inactive_users(self._session_factory, session=session)
+        # Log outside of the timed block so logger I/O is not measured
+        self._logger.info(
+            "Retrieved users",
+            execution_count=execution_count,
+            execution_time=elapsed()
+        )
 
         return {
             "inactive_users": inactive_usrs,
@@ -219,7 +253,7 @@ def main():
     app = TestApp()
     try:
         app.setup()
-        app.populate_users_in_db(batch_size=100)
+        app.populate_users_in_db(batch_size=10000)
         app.get_users(execution_count=100)
     except RuntimeError as err:
         logger.exception(
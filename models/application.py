@@ -1,7 +1,7 @@
 """Application DB Models"""
 # coding: utf-8
 from sqlalchemy import (
-    CHAR,CheckConstraint, Column, Integer, Text, text, ForeignKey, Table
+    CHAR,CheckConstraint, Column, Index, Integer, Text, text, ForeignKey, Table
 )
 from sqlalchemy.orm import relationship
 
@@ -20,6 +20,12 @@ class Users(Base):    # pylint:disable=too-few-public-methods
     __table_args__ = (
         CheckConstraint("active in ('Y', 'N')"),
         CheckConstraint("admin in ('Y', 'N')"),
+        Index('ix_users_active', 'active'),
+        # Partial index, only active admins are ever looked up by admin flag
+        Index(
+            'ix_users_active_admin', 'active', 'admin',
+            sqlite_where=text("active = 'Y'"), postgresql_where=text("active = 'Y'")
+        ),
     )
 
     id = Column(Integer, primary_key=True)
@@ -36,7 +42,10 @@ class Users(Base):    # pylint:disable=too-few-public-methods
     active = Column(CHAR(1), nullable=False, server_default=text("'Y'"))
     admin = Column(CHAR(1), nullable=False, server_default=text("'N'"))
 
-    resources = relationship("Resources", secondary=user_resources, back_populates="users")
+    # Lazy loading is disabled to avoid N+1 queries, use an explicit loader option instead
+    resources = relationship(
+        "Resources", secondary=user_resources, back_populates="users", lazy="raise"
+    )
 
 class Resources(Base):
     """Resource model defined by developer"""
@@ -47,4 +56,6 @@ class Resources(Base):
     resource_type = Column(Text, nullable=False)
     description = Column(Text)
 
-    users = relationship("Users", secondary=user_resources, back_populates="resources")
\ No newline at end of file
+    users = relationship(
+        "Users", secondary=user_resources, back_populates="resources", lazy="raise"
+    )
\ No newline at end of file
@@ -10,17 +10,21 @@ class Base(DECLARATIVE_BASE):    # pylint:disable=too-few-public-methods
     """Base model class"""
     __abstract__ = True
 
+    @classmethod
+    def _col_keys(cls):
+        """Return column attribute keys of the model, computed once per class"""
+        col_keys = cls.__dict__.get('__col_keys__')
+        if col_keys is None:
+            col_keys = tuple(col.key for col in inspect(cls).column_attrs)
+            cls.__col_keys__ = col_keys
+        return col_keys
+
     def to_dict(self, flat=False, exclude_keys=None):    # pylint:disable=unused-argument
         """Convert a data type (like a Pydantic model) to something compatible with JSON
 
             Inspired by  https://fastapi.tiangolo.com/tutorial/encoder/
         """
-        exclude_keys = exclude_keys or []
-        col_attrs = inspect(self).mapper.mapper.column_attrs
-
-        raw_dict = {}
-        for col in col_attrs:
-            if col.key not in exclude_keys:
-                raw_dict[col.key] = getattr(self, col.key)
-
-        return raw_dict
\ No newline at end of file
+        exclude_keys = frozenset(exclude_keys or ())
+        return {
+            key: getattr(self, key) for key in self._col_keys() if key not in exclude_keys
+        }
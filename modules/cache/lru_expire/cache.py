@@ -1,21 +1,34 @@
 """LRU Cache"""
-from datetime import datetime, timedelta
+import threading
 from functools import wraps
-from repoze.lru import lru_cache
+from timeit import default_timer
+
+try:
+    from functools import lru_cache
+except ImportError:    # Python 2.7
+    from repoze.lru import lru_cache
 
 
 def lru_cache_expiring(maxsize=128, expires=20):
     """LRU cache decorator"""
     def wrapper_cache(func):
-        func = lru_cache(maxsize=maxsize)(func)
-        func.lifetime = timedelta(seconds=expires)
-        func.expiration = datetime.utcnow() + func.lifetime
+        lru = lru_cache(maxsize=maxsize)
+        func = lru(func)
+        # functools exposes cache_clear() on the wrapper, repoze.lru keeps the cache on the decorator
+        cache_clear = getattr(func, "cache_clear", None) or lru.cache.clear
+        func.lifetime = expires
+        func.expiration = default_timer() + func.lifetime
+        lock = threading.Lock()
 
         @wraps(func)
         def wrapped_func(*args, **kwargs):
-            if datetime.utcnow() >= func.expiration:
-                func.clear()
-                func.expiration = datetime.utcnow() + func.lifetime
+            now = default_timer()
+            if now >= func.expiration:
+                with lock:
+                    # Another thread may have already cleared the cache
+                    if now >= func.expiration:
+                        cache_clear()
+                        func.expiration = now + func.lifetime
             return func(*args, **kwargs)
 
         return wrapped_func
@@ -10,10 +10,14 @@ class SingletonABCMeta(abc.ABCMeta):
     _lock = threading.RLock()
 
     def __call__(cls, *args, **kwargs):
-        with cls._lock:
-            if cls not in cls._instances:
-                cls._instances[cls] = super(SingletonABCMeta, cls).__call__(*args, **kwargs)
-        return cls._instances[cls]
+        instance = cls._instances.get(cls)
+        if instance is None:
+            with cls._lock:
+                instance = cls._instances.get(cls)
+                if instance is None:
+                    instance = super(SingletonABCMeta, cls).__call__(*args, **kwargs)
+                    cls._instances[cls] = instance
+        return instance
 
 
 class ParameterizedSingletonMeta(abc.ABCMeta):
@@ -22,9 +26,15 @@ class ParameterizedSingletonMeta(abc.ABCMeta):
     _lock = threading.RLock()
 
     def __call__(cls, db_path, *args, **kwargs):
-        with cls._lock:
-            # Use path as the key for different instances
-            if (cls, db_path) not in cls._instances:
-                cls._instances[(cls, db_path)] = super(ParameterizedSingletonMeta,
-                                                       cls).__call__(db_path, *args, **kwargs)
-        return cls._instances[(cls, db_path)]
+        # Use path as the key for different instances
+        key = (cls, db_path)
+        # The lock is only taken when the instance has not been created yet
+        instance = cls._instances.get(key)
+        if instance is None:
+            with cls._lock:
+                instance = cls._instances.get(key)
+                if instance is None:
+                    instance = super(ParameterizedSingletonMeta,
+                                     cls).__call__(db_path, *args, **kwargs)
+                    cls._instances[key] = instance
+        return instance
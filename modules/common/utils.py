@@ -1,5 +1,4 @@
 """Contains common util functions"""
-import inspect
 from pathlib2 import Path
 import sys
 from modules.cache import lru_expire as lrue
@@ -12,14 +11,9 @@ def get_module_dir(level= 1):
                   1 = direct caller (default)
                   2 = caller of caller, etc.
     """
-    # Get the frame of the caller
-    frame = inspect.stack()[level]
-    module = inspect.getmodule(frame[0])
-
-    if module is None or not hasattr(module, "__file__"):
-        filename = frame.filename
-    else:
-        filename = module.__file__
+    # Get the frame of the caller without walking the whole stack
+    frame = sys._getframe(level)    # pylint:disable=protected-access
+    filename = frame.f_globals.get("__file__") or frame.f_code.co_filename
 
     return Path(filename).resolve().parent
 
@@ -3,7 +3,11 @@
 import os
 import yaml
 from pathlib2 import Path
-from voluptuous import Schema, Required, Optional, All, Range, Coerce, ALLOW_EXTRA, In
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+from voluptuous import Schema, Required, Optional, All, Range, Coerce, ALLOW_EXTRA, In, Boolean
 # from voluptuous.util import DefaultTo
 from modules.common.utils import initialize_application
 
@@ -41,8 +45,19 @@ DATABASE_STRUCTURE_SCHEMA = Schema({
     Required("name"): str,
     Required("fl_name_template"): str,
     Required("engine_template"): str,
+    Optional("engine_options", default={}): dict,
 })
 
+# Keyword arguments passed through to sqlalchemy.create_engine. Known numeric and
+# boolean options are coerced, so they can be overridden from environment variables.
+ENGINE_OPTIONS_SCHEMA = Schema({
+    Optional("pool_size"): Coerce(int),
+    Optional("max_overflow"): Coerce(int),
+    Optional("pool_timeout"): Coerce(int),
+    Optional("pool_recycle"): Coerce(int),
+    Optional("pool_pre_ping"): Boolean(),
+}, extra=ALLOW_EXTRA)
+
 
 LOGGER_CFG_SCHEMA = Schema({
     Optional("level", default="DEBUG"): All(str.upper, In([
@@ -60,18 +75,20 @@ LOGGER_CFG_SCHEMA = Schema({
     Optional("use_stdout", default=True): bool,
 })
 
+# Nested sections are only type checked here, each one is validated
+# once by its own schema in the corresponding config object.
 LOGGER_SCHEMA = Schema({
     Required("dir"): str,
     Required("name"): str,
-    Optional("config", default={}): LOGGER_CFG_SCHEMA
+    Optional("config", default={}): dict
 })
 
 
 CONFIG_SCHEMA = Schema({
     Optional("debug", default=False): bool,
-    Required("db"): DATABASE_STRUCTURE_SCHEMA,
-    Required("data"): DATA_STRUCTURE_SCHEMA,
-    Required("log"): LOGGER_SCHEMA
+    Required("db"): dict,
+    Required("data"): dict,
+    Required("log"): dict
 })
 
 
@@ -96,8 +113,8 @@ class YamlSettingsLoader(object):
         elif not (self.cfg_file.exists() and self.cfg_file.is_file()):
             data = {}
         else:
-            with open(str(self.cfg_file), "r") as fl:
-                data = yaml.safe_load(fl)
+            with open(str(self.cfg_file), "rb") as fl:
+                data = yaml.load(fl, Loader=YamlLoader)
         return data
 
 
@@ -107,7 +124,7 @@ class DataConfig(object):
     def __init__(self, data, base_dir):
         validated = DATA_STRUCTURE_SCHEMA(data)
         self.dir = validated["dir"]
-        self.absolute_dir = base_dir.joinpath(self.dir).resolve()
+        self.absolute_dir = base_dir.joinpath(self.dir).absolute()
 
 class DataBaseConfig(object):
     """DataConfig Database configuration"""
@@ -117,9 +134,11 @@ class DataBaseConfig(object):
         self.db_name = validated["fl_name_template"].format(validated["name"])
 
         self.db_path = base_dir.joinpath(self.db_name)
-        self.absolute_db_path = self.db_path.resolve()
+        # The database file may not exist yet, so no filesystem lookup is needed
+        self.absolute_db_path = self.db_path.absolute()
 
         self.uri = validated["engine_template"].format(self.absolute_db_path)
+        self.engine_options = ENGINE_OPTIONS_SCHEMA(validated["engine_options"])
 
 class LoggerSetup(object):
     """Logger instance configuration"""
@@ -128,7 +147,11 @@ class LoggerSetup(object):
         validated = LOGGER_CFG_SCHEMA(data)
         self.level = validated["level"].strip().upper()
         self.timestamp_format = validated["timestamp_format"]
-        self.log_format = validated["log_format"].decode('utf-8')
+        log_format = validated["log_format"]
+        # Only Python 2 byte strings need decoding, Python 3 str has no decode()
+        if isinstance(log_format, bytes):
+            log_format = log_format.decode('utf-8')
+        self.log_format = log_format
         self.coloring = validated["coloring"]
         self.use_stdout = validated["use_stdout"]
 
@@ -140,7 +163,7 @@ class LoggerConfig(object):
     def __init__(self, data, base_dir):
         validated = LOGGER_SCHEMA(data)
         self.dir = validated["dir"]
-        self.absolute_dir = base_dir.joinpath(self.dir)
+        self.absolute_dir = base_dir.joinpath(self.dir).absolute()
         self.file = self.absolute_dir.joinpath(
             "{}.log".format(validated["name"])
         )
@@ -153,13 +176,16 @@ class Settings(object):
     __instance__ = None
     __env_prefix__ = "be_"
 
-    def __new__(cls):
+    def __new__(cls, *args, **kwargs):
         if cls.__instance__ is None:
             cls.__instance__ = super(Settings, cls).__new__(cls)
+            cls.__instance__._initialized = False
         return cls.__instance__
 
     def __init__(self, cfg_path=DEFAULT_CFG_NAME):
-        self.base_folder = Path.cwd().resolve().absolute()
+        if self._initialized:
+            return
+        self.base_folder = initialize_application()
         self._yaml_config = CONFIG_SCHEMA(
             self._load_yaml_config(cfg_path=cfg_path)
         )
@@ -167,10 +193,15 @@ class Settings(object):
         self.data = DataConfig(self._yaml_config["data"], base_dir=self.base_folder)
         self.db = DataBaseConfig(self._yaml_config["db"], base_dir=self.data.absolute_dir)
         self.logger = LoggerConfig(self._yaml_config["log"], base_dir=self.base_folder)
+        self._initialized = True
 
+    @classmethod
+    def reset(cls):
+        """Drop the shared instance so the next call reads the configuration again."""
+        cls.__instance__ = None
 
     def _load_yaml_config(self, cfg_path):
-        config_path = Path(cfg_path).resolve().absolute()
+        config_path = Path(cfg_path).resolve()
         if not (config_path.exists() and config_path.is_file()):
             raise RuntimeError(
                 "Config file '{}' does not exists or not a file".format(
@@ -183,17 +214,21 @@ class Settings(object):
 
     def _load_env_overrides(self, config_data):
         """Load environment variable overrides with 'be_' prefix."""
-        for key, value in os.environ.items():
-            if key.lower().startswith(self.__env_prefix__):
-                # Remove prefix and split by '__' for nested keys
-                config_key = key[len(self.__env_prefix__):].lower()
-                keys = config_key.split('__')
-                # Navigate to the nested dict and set value
-                current = config_data
-                for k in keys[:-1]:
-                    if k not in current:
-                        current[k] = {}
-                    current = current[k]
-                current[keys[-1]] = value
+        prefix = self.__env_prefix__
+        prefix_len = len(prefix)
+        environ = os.environ
+        for key in environ:
+            # Compare only the prefix slice instead of lower-casing every key
+            if key[:prefix_len].lower() != prefix:
+                continue
+            # Remove prefix and split by '__' for nested keys
+            keys = key[prefix_len:].lower().split('__')
+            # Navigate to the nested dict and set value
+            current = config_data
+            for k in keys[:-1]:
+                if k not in current:
+                    current[k] = {}
+                current = current[k]
+            current[keys[-1]] = environ[key]
 
 # cfg = Settings()
@@ -7,6 +7,7 @@ from contextlib import contextmanager
 from datetime import datetime
 
 from pathlib2 import Path
+from six import with_metaclass
 from sqlalchemy import create_engine, event
 from sqlalchemy.orm import Session, sessionmaker
 
@@ -23,8 +24,7 @@ def _get_logger(logger_path):
     return get_logger(str(logger_path), level=logging.INFO)
 
 
-class DatabaseSingleton(object):
-    __metaclass__ = pt.ParameterizedSingletonMeta
+class DatabaseSingleton(with_metaclass(pt.ParameterizedSingletonMeta, object)):
 
     def __init__(self, db_path):
         self.db_path = db_path
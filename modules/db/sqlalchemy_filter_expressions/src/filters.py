@@ -1,56 +1,101 @@
+import operator
+
 from sqlalchemy import and_, not_, or_
 
+from modules.cache.lru_expire.cache import lru_cache
 from modules.db.sqlalchemy_filter_expressions import constants as cst
+from modules.db.sqlalchemy_filter_expressions import models as md
+
+_COMPARISON_OPS = {
+    cst.ComparisonOp.EQ: operator.eq,
+    cst.ComparisonOp.NEQ: operator.ne,
+    cst.ComparisonOp.GT: operator.gt,
+    cst.ComparisonOp.GTE: operator.ge,
+    cst.ComparisonOp.LT: operator.lt,
+    cst.ComparisonOp.LTE: operator.le,
+}
+
+_COLLECTION_OPS = {
+    cst.CollectionOp.IN: lambda column, values: column.in_(values),
+    cst.CollectionOp.NOT_IN: lambda column, values: ~column.in_(values),
+}
+
+_TEXT_OPS = {
+    cst.TextOp.LIKE: lambda column, pattern: column.like(pattern),
+    cst.TextOp.ILIKE: lambda column, pattern: column.ilike(pattern),
+    cst.TextOp.CONTAINS: lambda column, pattern: column.contains(pattern),
+}
+
+_LOGICAL_OPS = {
+    cst.LogicalOp.AND: and_,
+    cst.LogicalOp.OR: or_,
+    cst.LogicalOp.NOT: not_,
+}
+
+
+@lru_cache(maxsize=1024)
+def _column(model, name):
+    """Resolve a model attribute once per (model, field) pair"""
+    return getattr(model, name)
 
 
 class SQLAlchemyFilterBuilder(object):
 
+    # Visitors resolved per (builder class, node class), so subclasses get their own entries
+    _DISPATCH = {}
+
     def build_filter(self, node, model):
-        method = getattr(self, 'visit_{}'.format(node.__class__.__name__.strip().lower()), None)
-        if method is None:
-            raise ValueError("Unsupported node type: {}".format(node.__class__.__name__))
-        return method(node, model)
+        """Builds the clause bottom-up with an explicit stack rather than recursing per level"""
+        stack = [(node, False)]
+        results = []
+        while stack:
+            current, combine = stack.pop()
+            if combine:
+                # Operands were pushed in reverse, so their clauses sit on top in order
+                start = len(results) - len(current.operands)
+                conditions = results[start:]
+                del results[start:]
+                results.append(self._lookup(_LOGICAL_OPS, current.operator)(*conditions))
+            elif isinstance(current, md.Logical_Node):
+                stack.append((current, True))
+                stack.extend((operand, False) for operand in reversed(current.operands))
+            else:
+                results.append(self._visit(current, model))
+        return results[0]
+
+    def _visit(self, node, model):
+        visitor = self._DISPATCH.get((self.__class__, node.__class__))
+        if visitor is None:
+            visitor = self._resolve_visitor(node.__class__)
+        return visitor(self, node, model)
+
+    @classmethod
+    def _resolve_visitor(cls, node_cls):
+        visitor = getattr(cls, 'visit_{}'.format(node_cls.__name__.strip().lower()), None)
+        if visitor is None:
+            raise ValueError("Unsupported node type: {}".format(node_cls.__name__))
+        cls._DISPATCH[(cls, node_cls)] = visitor
+        return visitor
+
+    @staticmethod
+    def _lookup(ops, op):
+        try:
+            return ops[op]
+        except KeyError:
+            raise ValueError("Unsupported operator: {}".format(op))
 
     def visit_comparison_node(self, node, model):
-        column = getattr(model, node.field)
-        if node.operator == cst.ComparisonOp.EQ:
-            return column == node.value
-        if node.operator == cst.ComparisonOp.NEQ:
-            return column != node.value
-        if node.operator == cst.ComparisonOp.GT:
-            return column > node.value
-        if node.operator == cst.ComparisonOp.GTE:
-            return column >= node.value
-        if node.operator == cst.ComparisonOp.LT:
-            return column < node.value
-        if node.operator == cst.ComparisonOp.LTE:
-            return column <= node.value
+        column = _column(model, node.field)
+        return self._lookup(_COMPARISON_OPS, node.operator)(column, node.value)
 
     def visit_collection_node(self, node, model):
-        column = getattr(model, node.field)
-        if node.operator == cst.CollectionOp.IN:
-            return column.in_(node.values)
-        if node.operator == cst.CollectionOp.NOT_IN:
-            return ~column.in_(node.values)
+        column = _column(model, node.field)
+        return self._lookup(_COLLECTION_OPS, node.operator)(column, node.values)
 
     def visit_range_node(self, node, model):
-        column = getattr(model, node.field)
+        column = _column(model, node.field)
         return column.between(node.start, node.end)
 
     def visit_text_search_node(self, node, model):
-        column = getattr(model, node.field)
-        if node.operator == cst.TextOp.LIKE:
-            return column.like(node.pattern)
-        if node.operator == cst.TextOp.ILIKE:
-            return column.ilike(node.pattern)
-        if node.operator == cst.TextOp.CONTAINS:
-            return column.contains(node.pattern)
-
-    def visit_logical_node(self, node, model):
-        conditions = [self.build_filter(operand, model) for operand in node.operands]
-        if node.operator == cst.LogicalOp.AND:
-            return and_(*conditions)
-        elif node.operator == cst.LogicalOp.OR:
-            return or_(*conditions)
-        elif node.operator == cst.LogicalOp.NOT:
-            return not_(*conditions)
+        column = _column(model, node.field)
+        return self._lookup(_TEXT_OPS, node.operator)(column, node.pattern)
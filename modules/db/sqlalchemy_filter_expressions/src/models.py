@@ -10,40 +10,40 @@ FilterNodeType = typing.TypeVar('FilterNodeType', bound='FilterNode')
 T = typing.TypeVar('T')
 
 
-@attr.s(auto_attribs=False)    # auto_attribs is not supported in older versions
+@attr.s(auto_attribs=False, slots=True)    # auto_attribs is not supported in older versions
 class FilterNode(object):
     pass
 
 
-@attr.s(auto_attribs=False)
+@attr.s(auto_attribs=False, slots=True)
 class Comparison_Node(FilterNode):
     field = attr.ib(type=str)
     operator = attr.ib(type=cst.ComparisonOp)
     value = attr.ib(type="typing.Any")
 
 
-@attr.s(auto_attribs=False)
+@attr.s(auto_attribs=False, slots=True)
 class Collection_Node(FilterNode):
     field = attr.ib(type=str)
     operator = attr.ib(type=cst.CollectionOp)
     values = attr.ib(type="typing.List[typing.Any]")
 
 
-@attr.s(auto_attribs=False)
+@attr.s(auto_attribs=False, slots=True)
 class Range_Node(FilterNode):
     field = attr.ib(type=str)
     start = attr.ib(type=typing.Any)
     end = attr.ib(type=typing.Any)
 
 
-@attr.s(auto_attribs=False)
+@attr.s(auto_attribs=False, slots=True)
 class Text_Search_Node(FilterNode):
     field = attr.ib(type=str)
     operator = attr.ib(type=cst.TextOp)
     pattern = attr.ib(type=str)
 
 
-@attr.s(auto_attribs=False)
+@attr.s(auto_attribs=False, slots=True)
 class Logical_Node(FilterNode):
     operator = attr.ib(type=cst.LogicalOp)
     operands = attr.ib(factory=list, type=typing.List[FilterNode])
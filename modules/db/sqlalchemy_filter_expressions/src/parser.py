@@ -1,15 +1,19 @@
 """Query Filter String Parser"""
 from lark import Lark
 
+from modules.cache.lru_expire.cache import lru_cache
 from modules.db.sqlalchemy_filter_expressions import grammar as gr
 from modules.db.sqlalchemy_filter_expressions import models as md
 from modules.db.sqlalchemy_filter_expressions import transformers as trns
 
-class FilterParser(object):
+# Building the LALR tables is expensive, so the grammar is compiled once per process
+_LARK = Lark(gr.GRAMMAR, parser='lalr', transformer=trns.FilterTransformer())
+
+# The same expressions recur constantly; the builder never mutates the returned AST
+_parse = lru_cache(maxsize=512)(_LARK.parse)
 
-    def __init__(self):
-        self.parser = Lark(gr.GRAMMAR, parser='lalr', transformer=trns.FilterTransformer())
 
+class FilterParser(object):
 
     def parse(self, expression):
-        return self.parser.parse(expression)
+        return _parse(expression)
\ No newline at end of file
@@ -4,6 +4,20 @@ from lark import Transformer
 from modules.db.sqlalchemy_filter_expressions import constants as cst
 from modules.db.sqlalchemy_filter_expressions import models as md
 
+_COMPARISON = "comparison"
+_COLLECTION = "collection"
+_RANGE = "range"
+_TEXT = "text"
+
+# Operator string -> (kind of node it produces, enum member), built once so parsing
+# avoids scanning every enum and the EnumMeta value lookup per expression
+_OPERATORS = dict(
+    [(member.value, (_COMPARISON, member)) for member in cst.ComparisonOp]
+    + [(member.value, (_COLLECTION, member)) for member in cst.CollectionOp]
+    + [(member.value, (_RANGE, member)) for member in cst.RangeOp]
+    + [(member.value, (_TEXT, member)) for member in cst.TextOp]
+)
+
 
 class FilterTransformer(Transformer):
 
@@ -16,22 +30,22 @@ class FilterTransformer(Transformer):
     def not_op(self, args):
         return md.Logical_Node(operator=cst.LogicalOp.NOT, operands=list(args))
 
+    # Lark tokens are str subclasses, so field and operator names are used as-is
     def field(self, args):
-        return str(args[0])
+        return args[0]
 
     def operator(self, args):
-        return str(args[0])
+        return args[0]
 
     def string_value(self, args):
-        value = args[0]
-        if value.startswith('"') and value.endswith('"'):
-            return value[1:-1]
-        return value
+        # Only ESCAPED_STRING reaches here, so the surrounding quotes are always present
+        return args[0][1:-1]
 
     def number_value(self, args):
         return float(args[0])
 
     def name_value(self, args):
+        # Values end up as bound parameters, pass the driver a plain str rather than a Token
         return str(args[0])
 
     def single_value_expr(self, args):
@@ -42,18 +56,18 @@ class FilterTransformer(Transformer):
 
     def comparison_expr(self, args):
         field, op, value = args
-        op = str(op)    # Ensure operator is string
+        kind, member = _OPERATORS.get(op, (None, None))
 
-        if op in cst.ComparisonOp.values():
-            return md.Comparison_Node(field=field, operator=cst.ComparisonOp(op), value=value)
-        if op in cst.CollectionOp.values():
+        if kind == _COMPARISON:
+            return md.Comparison_Node(field=field, operator=member, value=value)
+        if kind == _COLLECTION:
             if not isinstance(value, list):
                 value = [value]
-            return md.Collection_Node(field=field, operator=cst.CollectionOp(op), values=value)
-        if op == cst.RangeOp.values():
+            return md.Collection_Node(field=field, operator=member, values=value)
+        if kind == _RANGE:
             if not isinstance(value, list) or len(value) != 2:
                 raise ValueError("Between operator requires exactly two values")
             return md.Range_Node(field=field, start=value[0], end=value[1])
-        if op in cst.TextOp.values():
-            return md.Text_Search_Node(field=field, operator=cst.TextOp(op), pattern=str(value))
+        if kind == _TEXT:
+            return md.Text_Search_Node(field=field, operator=member, pattern=str(value))
         raise ValueError("Unknown operator: {}".format(op))
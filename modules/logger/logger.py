@@ -12,16 +12,18 @@ Features:
     - ConsoleRenderer for local runs
 """
 import abc
+import atexit
 import io
 import os
 import pprint
 import sys
+import time
 from datetime import datetime
 
 import better_exceptions
 import structlog
 from pathlib2 import Path
-from six import PY2, StringIO, string_types
+from six import string_types, with_metaclass
 from structlog.dev import ConsoleRenderer
 
 try:
@@ -31,8 +33,37 @@ except ImportError:
 
 # Default configuration
 DEFAULT_LOG_FORMAT = u'[{level}] [{timestamp}] {message}'
+# Positional equivalent of DEFAULT_LOG_FORMAT, cheaper to format than keyword fields
+DEFAULT_LOG_LINE_FORMAT = u'[{0}] [{1}] {2}'
 DEFAULT_TIMESTAMP_FORMAT = "%Y-%m-%d::%H:%M:%S"
 DEFAULT_LOG_LEVEL = "DEBUG"
+# Levels written through to disk immediately, everything else stays buffered
+FLUSH_METHODS = frozenset(("error", "critical", "exception"))
+# Numeric value per structlog method name, shared by filtering and config parsing
+LEVELS = {
+    "debug": 10,
+    "info": 20,
+    "warning": 30,
+    "warn": 30,
+    "error": 40,
+    "critical": 50,
+    "exception": 50,
+}
+# Event keys already rendered in the log line itself
+LINE_KEYS = frozenset(("event", "timestamp", "level"))
+
+
+def level_number(level_name):
+    """
+    Convert level name to numeric value.
+
+    Args:
+        level_name (str): Level name
+
+    Returns:
+        int: Numeric level value, DEBUG for unknown names
+    """
+    return LEVELS.get(level_name.lower(), 10)
 
 
 class SingletonMeta(type):
@@ -42,6 +73,7 @@ class SingletonMeta(type):
     Ensures only one instance per unique configuration exists.
     """
     _instances = {}
+    _keys = {}  # log_file argument as given -> absolute path key
     _lock = None  # Python 2 doesn't need threading.Lock for simple cases
 
     def __call__(cls, *args, **kwargs):
@@ -53,10 +85,12 @@ class SingletonMeta(type):
         """
         # Create unique key based on log_file path
         log_file = kwargs.get('log_file', args[0] if args else 'default.log')
-        if not isinstance(log_file, Path):
-            log_file = Path(log_file)
-
-        key = str(log_file.absolute())
+        key = cls._keys.get(log_file)
+        if key is None:
+            # absolute() needs a getcwd call, so resolve each distinct argument only once
+            path = log_file if isinstance(log_file, Path) else Path(log_file)
+            key = str(path if path.is_absolute() else path.absolute())
+            cls._keys[log_file] = key
 
         if key not in cls._instances:
             instance = super(SingletonMeta, cls).__call__(*args, **kwargs)
@@ -65,6 +99,49 @@ class SingletonMeta(type):
         return cls._instances[key]
 
 
+class TimestampFormatter(object):
+
+    """
+    Format timestamps with second resolution, reusing the string within a second.
+
+    strftime is comparatively expensive, while consecutive log lines mostly share
+    the same second. Formats with microseconds (%f) are formatted on every call.
+    """
+
+    def __init__(self, timestamp_format):
+        """
+        Initialize formatter.
+
+        Args:
+            timestamp_format (str): Timestamp format string
+        """
+        self.timestamp_format = timestamp_format
+        self._per_second = '%f' not in timestamp_format
+        self._cached = (None, None)
+
+    def __call__(self, now=None):
+        """
+        Format a timestamp.
+
+        Args:
+            now (float): Seconds since the epoch, defaults to the current time
+
+        Returns:
+            str: Formatted local time
+        """
+        if now is None:
+            now = time.time()
+        if not self._per_second:
+            return datetime.fromtimestamp(now).strftime(self.timestamp_format)
+
+        second = int(now)
+        cached_second, formatted = self._cached
+        if second != cached_second:
+            formatted = time.strftime(self.timestamp_format, time.localtime(second))
+            self._cached = (second, formatted)
+        return formatted
+
+
 class BaseProcessor(object):
 
     """Abstract base class for log processors."""
@@ -108,9 +185,18 @@ class FileWriterProcessor(BaseProcessor):
         self.file_path = file_path
         self.log_format = log_format
         self.timestamp_format = timestamp_format
+        self._format_timestamp = TimestampFormatter(timestamp_format)
+        if log_format == DEFAULT_LOG_FORMAT:
+            self._format_line = DEFAULT_LOG_LINE_FORMAT.format
+        else:
+            self._format_line = self._format_custom_line
         self._ensure_directory()
         self.file_handle = None
 
+    def _format_custom_line(self, level, timestamp, message):
+        """Format a log line with a user supplied format string."""
+        return self.log_format.format(level=level, timestamp=timestamp, message=message)
+
     def _ensure_directory(self):
         """Create directory for log file if it doesn't exist."""
         log_dir = Path(self.file_path).parent
@@ -130,13 +216,11 @@ class FileWriterProcessor(BaseProcessor):
             dict: Unmodified event dictionary
         """
         if self.file_handle is None:
-            self.file_handle = io.open(self.file_path, 'a', encoding='utf-8')
-            print("=" * 40)
-            print(self.file_path)
-            print("=" * 40)
+            self.file_handle = io.open(self.file_path, 'a', encoding='utf-8', buffering=8192)
+            atexit.register(self.file_handle.close)
 
         # Format timestamp
-        timestamp = datetime.now().strftime(self.timestamp_format)
+        timestamp = self._format_timestamp()
 
         # Format level
         level = method_name.upper()
@@ -144,49 +228,28 @@ class FileWriterProcessor(BaseProcessor):
         # Format message
         event = event_dict.get('event', '')
 
-        # Build log line
-        log_line = self.log_format.format(level=level, timestamp=timestamp, message=event)
-
-        # Add extra fields if present
-        extra_fields = []
-        for key, value in event_dict.items():
-            if key not in ['event', 'timestamp', 'level']:
-                extra_fields.append(u"\n\t{key}: {value}".format(key=key, value=value))
-
-        if extra_fields:
-            log_line += u"".join(extra_fields)
+        # Build log line with extra fields appended
+        log_line = self._format_line(level, timestamp, event) + u"".join(
+            u"\n\t{0}: {1}".format(key, value)
+            for key, value in event_dict.items() if key not in LINE_KEYS
+        )
 
         # Write to file
         try:
             self.file_handle.write(log_line + u"\n")
-            self.file_handle.flush()
+            if method_name in FLUSH_METHODS:
+                self.file_handle.flush()
         except Exception as e:
             sys.stderr.write("Error writing to log file: {}\n".format(e))
 
         return event_dict
 
-    def __del__(self):
-        """Close file handle on cleanup."""
-        if self.file_handle:
-            try:
-                self.file_handle.close()
-            except Exception:
-                pass
-
 
 class LevelFilter(BaseProcessor):
 
     """Filter logs by minimum level."""
 
-    LEVEL_MAP = {
-        "debug": 10,
-        "info": 20,
-        "warning": 30,
-        "warn": 30,
-        "error": 40,
-        "critical": 50,
-        "exception": 60,
-    }
+    LEVEL_MAP = LEVELS
 
     def __init__(self, min_level):
         """
@@ -195,28 +258,7 @@ class LevelFilter(BaseProcessor):
         Args:
             min_level (str): Minimum log level (DEBUG, INFO, etc.)
         """
-        self.min_level = self._get_level_number(min_level)
-
-    @staticmethod
-    def _get_level_number(level_name):
-        """
-        Convert level name to numeric value.
-
-        Args:
-            level_name (str): Level name
-
-        Returns:
-            int: Numeric level value
-        """
-        levels = {
-            'DEBUG': 10,
-            'INFO': 20,
-            'WARNING': 30,
-            'ERROR': 40,
-            'CRITICAL': 50,
-            'EXCEPTION': 50,
-        }
-        return levels.get(level_name.upper(), 10)
+        self.min_level = level_number(min_level)
 
     def __call__(self, logger, method_name, event_dict):
         """
@@ -230,7 +272,8 @@ class LevelFilter(BaseProcessor):
         Returns:
             dict: Event dictionary or raises DropEvent
         """
-        current_level = self.LEVEL_MAP.get(method_name.lower(), 0)
+        # structlog method names are always lower case
+        current_level = self.LEVEL_MAP.get(method_name, 0)
         if current_level < self.min_level:
             raise structlog.DropEvent
         return event_dict
@@ -241,15 +284,31 @@ class EnvironmentDetector(object):
     """Detect runtime environment (local vs production)."""
 
     LOCAL_ENV_INDICATORS = ['local', 'dev', 'development']
+    _is_local_run = None  # Environment doesn't change during the process lifetime
 
     @classmethod
     def is_local_run(cls):
         """
         Detect if running locally.
 
+        The result is computed once and cached on the class.
+
         Returns:
             bool: True if local run detected
         """
+        if cls._is_local_run is None:
+            cls._is_local_run = cls._detect_local_run()
+        return cls._is_local_run
+
+    @classmethod
+    def _detect_local_run(cls):
+        """
+        Check environment variables for a local run.
+
+        Returns:
+            bool: Always True for now, the checks are kept for when the
+                local default is dropped
+        """
         env = os.environ.get('ENVIRONMENT', '').lower()
         env_short = os.environ.get('ENV', '').lower()
         is_production = os.environ.get('PRODUCTION', False)
@@ -321,12 +380,27 @@ class CustomConsoleRenderer(ConsoleRenderer):
         missing = l - len(s)
         return s + " " * (missing if missing > 0 else 0)
 
+    @staticmethod
+    def _format_kv(styles, key, value):
+        """
+        Formats a single *key* = *value* pair.
+        """
+        return "{}{}{} = {}{}{}".format(
+            styles.kv_key,
+            key,
+            styles.reset,
+            styles.kv_value,
+            value,
+            styles.reset
+        )
+
     def __call__(self, _, __, event_dict):
         # Initialize lazily to prevent import side-effects.
         if self._init_colorama:
             self._init_colorama_values(self._force_colors)
             self._init_colorama = False
-        sio = StringIO()
+        parts = []
+        append = parts.append
 
         level = event_dict.pop("level", None)
         if level is not None:
@@ -335,7 +409,7 @@ class CustomConsoleRenderer(ConsoleRenderer):
                 self._pad(level, self._longest_level),
                 self._styles.reset,
             )
-            sio.write(msg)
+            append(msg)
 
         ts = event_dict.pop("timestamp", None)
         if ts is not None:
@@ -344,11 +418,11 @@ class CustomConsoleRenderer(ConsoleRenderer):
                 str(ts),
                 self._styles.reset,
             )
-            sio.write(msg)
+            append(msg)
 
         # force event to str for compatibility with standard library
         event = event_dict.pop("event")
-        if not PY2 or not isinstance(event, string_types):
+        if not isinstance(event, string_types):
             event = str(event)
 
         if event_dict:
@@ -356,11 +430,11 @@ class CustomConsoleRenderer(ConsoleRenderer):
                               self._pad_event) + self._styles.reset + " "
         else:
             event += self._styles.reset
-        sio.write(self._styles.bright + event)
+        append(self._styles.bright + event)
 
         logger_name = event_dict.pop("logger", None)
         if logger_name is not None:
-            sio.write(
+            append(
                 "[{}{}{}{}]".format(
                     self._styles.logger_name,
                     self._styles.bright,
@@ -372,29 +446,22 @@ class CustomConsoleRenderer(ConsoleRenderer):
         stack = event_dict.pop("stack", None)
         exc = event_dict.pop("exception", None)
 
-        def format_evt(styles, key, value):
-            return "{}{}{} = {}{}{}".format(
-                styles.kv_key,
-                key,
-                styles.reset,
-                styles.kv_value,
-                value,
-                styles.reset
-            )
-        msg = "\n\t".join(format_evt(self._styles, key, value) for key, value in event_dict.iteritems())
-        sio.write("\n\t" + msg if msg else "")
+        styles = self._styles
+        msg = "\n\t".join(self._format_kv(styles, key, value) for key, value in event_dict.items())
+        if msg:
+            append("\n\t" + msg)
 
         if stack is not None:
-            sio.write("\n{}".format(stack))
+            append("\n{}".format(stack))
             if exc is not None:
-                sio.write("\n\n{}\n".format("=" * 79))
+                append("\n\n{}\n".format("=" * 79))
         if exc is not None:
-            sio.write("\n{}".format(exc))
+            append("\n{}".format(exc))
 
-        return sio.getvalue()
+        return "".join(parts)
 
 
-class StructLogger(object):
+class StructLogger(with_metaclass(SingletonMeta, object)):
 
     """
     Main logger class with singleton pattern.
@@ -402,8 +469,6 @@ class StructLogger(object):
     Provides structured logging with file and console output.
     """
 
-    __metaclass__ = SingletonMeta
-
     def __init__(
         self,
         log_file='logs.log',
@@ -433,11 +498,12 @@ class StructLogger(object):
             use_colors=use_colors
         )
 
+        self._min_level = level_number(self.config.log_level)
         self._logger = None
         self._configure()
 
     def _configure(self):
-        """Configure structlog with processors."""
+        """Wrap a structlog logger with this instance's processors."""
         processors = self._build_processor_chain()
 
         if self.config.enable_stdout:
@@ -445,15 +511,15 @@ class StructLogger(object):
         else:
             stream_io = open(os.devnull, 'w')
 
-        structlog.configure(
+        # Scoped to this logger instead of the global structlog config, so loggers
+        # for different files don't overwrite each other's processor chains
+        self._logger = structlog.wrap_logger(
+            structlog.PrintLogger(stream_io),
             processors=processors,
             context_class=dict,
-            logger_factory=structlog.PrintLoggerFactory(stream_io),
             cache_logger_on_first_use=True,
         )
 
-        self._logger = structlog.get_logger(self.config.log_file.stem)
-
     @staticmethod
     def better_traceback(exc_info):
         """
@@ -486,12 +552,13 @@ class StructLogger(object):
             list: List of processors
         """
 
+        # LevelFilter only needs the method name, so dropped events skip all other processors
         processors = [
+            LevelFilter(self.config.log_level),
             structlog.stdlib.add_log_level,
             structlog.processors.TimeStamper(fmt=self.config.timestamp_format),
             structlog.processors.StackInfoRenderer(),
             structlog.processors.UnicodeDecoder(), structlog.processors.format_exc_info,
-            LevelFilter(self.config.log_level)
         ]
 
         # Add file writer
@@ -529,6 +596,18 @@ class StructLogger(object):
                 )
         return processors
 
+    def is_enabled_for(self, level):
+        """
+        Check if messages of the given level pass the level filter.
+
+        Args:
+            level (str): Log level name (debug, info, etc.)
+
+        Returns:
+            bool: True if messages of this level are logged
+        """
+        return level_number(level) >= self._min_level
+
     def debug(self, message, **kwargs):
         """Log debug message."""
         self._logger.debug(message, **kwargs)
@@ -5,6 +5,8 @@ from queries.application.application import (
     get_inactive_users,
     get_users_paginated,
     get_active_users_paginated,
+    get_users_keyset,
+    get_active_users_keyset,
 )
 
 __all__ = [
@@ -14,4 +16,6 @@ __all__ = [
     "get_inactive_users",
     "get_users_paginated",
     "get_active_users_paginated",
+    "get_users_keyset",
+    "get_active_users_keyset",
 ]
\ No newline at end of file
@@ -1,98 +1,247 @@
 """Contains logic to retrieve users info"""
 from lark.exceptions import UnexpectedToken
+from sqlalchemy import func, select
 
 from models.application import Users
+from modules.cache import lru_expire as lrue
+from modules.cache.lru_expire.cache import lru_cache
 from modules.db import sqlalchemy_filter_expressions as sql_fe
 
 
-def parse_filters(filters_str):
-    if isinstance(filters_str, str) and filters_str:
-        parser = sql_fe.parser.FilterParser()
-        try:
-            ast = parser.parse(filters_str)
-        except UnexpectedToken:
-            ast = None
-    else:
-        ast = None
-    return ast
-
-
 _FILTER_PARSER = sql_fe.parser.FilterParser()
-_AST_CACHE = {}
+# The builder keeps no per-call state, its visitor cache lives on the class
+_FILTER_BUILDER = sql_fe.filters.SQLAlchemyFilterBuilder()
+
 
 def optimized_parse_filters(filters_str):
-    if not (isinstance(filters_str, str) and filters_str):
+    if not filters_str:
         return None
-
-    if filters_str in _AST_CACHE:
-        return _AST_CACHE[filters_str]
-
+    # FilterParser.parse is memoized per expression
     try:
-        ast = _FILTER_PARSER.parse(filters_str)
-        _AST_CACHE[filters_str] = ast
-        return ast
+        return _FILTER_PARSER.parse(filters_str)
     except UnexpectedToken:
         return None
 
 
-def get_users(session_factory, filter_str=None, to_dict=False):
-    """Returns all users matching the given conditions"""
+parse_filters = optimized_parse_filters
+
+
+@lru_cache(maxsize=256)
+def _compiled_filter(filter_str, model):
+    """Returns the clause for filter_str against model, or None if there is nothing to filter by"""
     filter_ast = optimized_parse_filters(filters_str=filter_str)
+    if filter_ast is None:
+        return None
+    return _FILTER_BUILDER.build_filter(filter_ast, model)
+
+
+ACTIVE_USERS_FILTER = "active:eq:Y"
+INACTIVE_USERS_FILTER = "active:eq:N"
+ADMIN_USERS_FILTER = "active:eq:Y and admin:eq:Y"
+
+# Columns in Users.to_dict() order. Dict results are built from plain rows
+# instead of loading ORM instances only to convert them back
+_USER_KEYS = Users._col_keys()
+_USER_COLUMNS = tuple(getattr(Users, key) for key in _USER_KEYS)
+
+
+@lru_cache(maxsize=64)
+def _users_select(filters, to_dict=False):
+    """SELECT statement for the users matching filters, built once per (cached) clause"""
+    stmt = select(*_USER_COLUMNS) if to_dict else select(Users)
+    if filters is not None:
+        stmt = stmt.where(filters)
+    return stmt
+
+
+def _execute_users(session, stmt, to_dict=False):
+    result = session.execute(stmt)
+    return result if to_dict else result.scalars()
+
+
+def _fetch_users(session, stmt, to_dict=False):
+    return _execute_users(session, stmt, to_dict).all()
+
+
+def _as_dicts(rows):
+    return [dict(zip(_USER_KEYS, row)) for row in rows]
+
+
+def _query_users(session, filters, to_dict=False):
+    res = _fetch_users(session, _users_select(filters, to_dict), to_dict)
+    return _as_dicts(res) if to_dict else res
+
+
+STREAM_BATCH_SIZE = 500
 
+
+def _iter_users(session, filters, to_dict=False):
+    stmt = _users_select(filters, to_dict).execution_options(yield_per=STREAM_BATCH_SIZE)
+    rows = _execute_users(session, stmt, to_dict)
+    if to_dict:
+        return (dict(zip(_USER_KEYS, row)) for row in rows)
+    return iter(rows)
+
+
+def _stream_users(session_factory, filters, to_dict=False):
+    # The session has to stay open until the caller has consumed every row
     with session_factory() as session:
-        query = session.query(Users)
-        if filter_ast:
-            fb = sql_fe.filters.SQLAlchemyFilterBuilder()
-            filters = fb.build_filter(filter_ast, Users)
-            query = query.filter(filters)
-        res = query.all()
+        for user in _iter_users(session, filters, to_dict):
+            yield user
+
+
+def _warm_constant_filters():
+    """Build the clauses and statements for the constant filters used by the helpers below"""
+    for filter_str in (ACTIVE_USERS_FILTER, INACTIVE_USERS_FILTER, ADMIN_USERS_FILTER):
+        for to_dict in (False, True):
+            _users_select(_compiled_filter(filter_str, Users), to_dict)
+
 
-    return list(map(lambda x: x.to_dict(), res)) if to_dict else res
+_warm_constant_filters()
 
 
-def get_inactive_users(session_factory, to_dict=False):
+def get_users(session_factory, filter_str=None, to_dict=False, session=None, stream=False):
+    """Returns all users matching the given conditions, as a list or a batched iterator with stream"""
+    filters = _compiled_filter(filter_str, Users)
+
+    if stream:
+        if session is None:
+            return _stream_users(session_factory, filters, to_dict)
+        return _iter_users(session, filters, to_dict)
+
+    if session is None:
+        with session_factory() as session:
+            return _query_users(session, filters, to_dict)
+    return _query_users(session, filters, to_dict)
+
+
+def get_inactive_users(session_factory, to_dict=False, session=None, stream=False):
     """Get list of inactive users"""
-    return get_users(session_factory, filter_str="active:eq:N", to_dict=to_dict)
+    return get_users(
+        session_factory, filter_str=INACTIVE_USERS_FILTER, to_dict=to_dict, session=session, stream=stream
+    )
 
 
-def get_active_users(session_factory, to_dict=False):
+def get_active_users(session_factory, to_dict=False, session=None, stream=False):
     """Get list of active categories"""
-    return get_users(session_factory, filter_str="active:eq:Y", to_dict=to_dict)
+    return get_users(
+        session_factory, filter_str=ACTIVE_USERS_FILTER, to_dict=to_dict, session=session, stream=stream
+    )
 
 
-def get_admin_users(session_factory, to_dict=False):
+def get_admin_users(session_factory, to_dict=False, session=None, stream=False):
     """Get list of active categories"""
-    return get_users(session_factory, filter_str="active:eq:Y and admin:eq:Y", to_dict=to_dict)
+    return get_users(
+        session_factory, filter_str=ADMIN_USERS_FILTER, to_dict=to_dict, session=session, stream=stream
+    )
+
 
+def _count_users(session, stmt):
+    # Plain SELECT count(users.id) ... instead of Query.count() wrapping the query in a subquery
+    return session.execute(stmt.with_only_columns(func.count(Users.id)).order_by(None)).scalar()
 
-def get_users_paginated(session_factory, filter_str=None, to_dict=True, page=1, per_page=10):
-    """Returns all users matching the given conditions with pagination"""
-    filter_ast = parse_filters(filters_str=filter_str)
 
+@lrue.lru_cache_expiring(maxsize=64, expires=10)
+def _cached_count_users(session_factory, filter_str):
+    """Total number of users matching filter_str, reused for a few seconds"""
     with session_factory() as session:
-        query = session.query(Users)
+        return _count_users(session, _users_select(_compiled_filter(filter_str, Users), False))
+
+
+def get_users_paginated(
+    session_factory, filter_str=None, to_dict=True, page=1, per_page=10, skip_count=False, fresh=False,
+    session=None
+):
+    """Returns a page of users matching the given conditions as (data, total_count, has_next)"""
+    if session is None:
+        with session_factory() as session:
+            return get_users_paginated(
+                session_factory,
+                filter_str=filter_str,
+                to_dict=to_dict,
+                page=page,
+                per_page=per_page,
+                skip_count=skip_count,
+                fresh=fresh,
+                session=session
+            )
+
+    stmt = _users_select(_compiled_filter(filter_str, Users), to_dict)
+
+    offset = (page - 1) * per_page
+
+    if skip_count:
+        total_count = None
+        res = _fetch_users(session, stmt.limit(per_page + 1).offset(offset), to_dict)
+        has_next = len(res) > per_page
+        res = res[:per_page]
+    else:
+        if fresh:
+            total_count = _count_users(session, stmt)
+        else:
+            total_count = _cached_count_users(session_factory, filter_str)
+        res = _fetch_users(session, stmt.limit(per_page).offset(offset), to_dict)
+        has_next = offset + len(res) < total_count
 
-        if filter_ast:
-            fb = sql_fe.filters.SQLAlchemyFilterBuilder()
-            filters = fb.build_filter(filter_ast, Users)
-            query = query.filter(filters)
+    data = _as_dicts(res) if to_dict else res
 
-        total_count = query.count()
+    return data, total_count, has_next
 
-        offset = (page - 1) * per_page
 
-        res = query.limit(per_page).offset(offset).all()
+def _keyset_users(session, filters, after_userid, per_page, to_dict):
+    stmt = _users_select(filters, to_dict)
+    if after_userid is not None:
+        stmt = stmt.where(Users.userid > after_userid)
 
-    data = [x.to_dict() for x in res] if to_dict else res
+    return _fetch_users(session, stmt.order_by(Users.userid).limit(per_page + 1), to_dict)
 
-    return data, total_count
 
-def get_active_users_paginated(session_factory, to_dict=False, page=1, per_page=10):
+def get_users_keyset(
+    session_factory, filter_str=None, to_dict=True, after_userid=None, per_page=10, session=None
+):
+    """Returns a page of users ordered by userid after after_userid as (data, next_cursor)"""
+    if per_page < 1:
+        raise ValueError("per_page must be at least 1, got {}".format(per_page))
+
+    filters = _compiled_filter(filter_str, Users)
+
+    if session is None:
+        with session_factory() as session:
+            res = _keyset_users(session, filters, after_userid, per_page, to_dict)
+    else:
+        res = _keyset_users(session, filters, after_userid, per_page, to_dict)
+
+    has_next = len(res) > per_page
+    res = res[:per_page]
+    next_cursor = res[-1].userid if has_next else None
+
+    data = _as_dicts(res) if to_dict else res
+
+    return data, next_cursor
+
+def get_active_users_paginated(
+    session_factory, to_dict=False, page=1, per_page=10, skip_count=False, fresh=False, session=None
+):
     """Get list of active users with pagination"""
     return get_users_paginated(
         session_factory,
-        filter_str="active:eq:Y",
+        filter_str=ACTIVE_USERS_FILTER,
         to_dict=to_dict,
         page=page,
-        per_page=per_page
+        per_page=per_page,
+        skip_count=skip_count,
+        fresh=fresh,
+        session=session
+    )
+
+
+def get_active_users_keyset(session_factory, to_dict=False, after_userid=None, per_page=10, session=None):
+    """Get list of active users with keyset pagination"""
+    return get_users_keyset(
+        session_factory,
+        filter_str=ACTIVE_USERS_FILTER,
+        to_dict=to_dict,
+        after_userid=after_userid,
+        per_page=per_page,
+        session=session
     )
\ No newline at end of file
@@ -1,14 +1,31 @@
 # -*- coding: utf-8 -*-
+import os
+
 from flask import Flask, jsonify, request
+from sqlalchemy.orm import scoped_session, sessionmaker
 from alembic.config import Config
 from alembic import command
 from main import TestApp
-from queries.application import get_active_users_paginated
+from queries.application import get_active_users_keyset, get_active_users_paginated
 from pathlib2 import Path
 from modules.logger import get_logger
 
+try:
+    import orjson
+except ImportError:    # Python 2.7 or orjson not installed
+    orjson = None
+
 app = Flask(__name__)
 
+
+def _json_response(payload, status=200):
+    """Serialize payload with orjson when it is available, flask.jsonify otherwise."""
+    if orjson is None:
+        return jsonify(payload), status
+    return app.response_class(
+        orjson.dumps(payload, default=str), status=status, mimetype="application/json"
+    )
+
 def run_migrations():
     """Alembic migration function."""
     print("Running migrations...")
@@ -17,38 +34,82 @@ def run_migrations():
     print("Migrations complete.")
 
 test_app = TestApp()
+# One session per request thread, shared by all queries of the request and
+# bound to the application engine on startup
+Session = scoped_session(sessionmaker())
+
+
+@app.teardown_appcontext
+def remove_session(exception=None):
+    Session.remove()
+
 
 @app.route('/active-users', methods=['GET'])
 def active_users():
     try:
         page = request.args.get('page', default=1, type=int)
         per_page = request.args.get('per_page', default=10, type=int)
+        # Keyset pagination, an empty cursor requests the first page
+        cursor = request.args.get('cursor')
+        if cursor is not None:
+            users_data, next_cursor = get_active_users_keyset(
+                test_app.session_factory,
+                to_dict=True,
+                after_userid=cursor or None,
+                per_page=per_page,
+                session=Session()
+            )
+            return _json_response({
+                "status": "success",
+                "metadata": {
+                    "per_page": per_page,
+                    "next_cursor": next_cursor
+                },
+                "data": users_data
+            })
+
+        # Skips the COUNT query, only has_next is reported then
+        skip_count = bool(request.args.get('skip_count', default=0, type=int))
+        # Bypasses the briefly cached total count
+        fresh = bool(request.args.get('fresh', default=0, type=int))
 
-        users_data, total_count = get_active_users_paginated(
+        users_data, total_count, has_next = get_active_users_paginated(
             test_app.session_factory,
             to_dict=True,
             page=page,
-            per_page=per_page
+            per_page=per_page,
+            skip_count=skip_count,
+            fresh=fresh,
+            session=Session()
         )
 
-        total_pages = (total_count + per_page - 1) // per_page
+        metadata = {
+            "current_page": page,
+            "per_page": per_page
+        }
+        if total_count is not None:
+            metadata["total_count"] = total_count
+            metadata["total_pages"] = (total_count + per_page - 1) // per_page
+        else:
+            metadata["has_next"] = has_next
 
-        return jsonify({
+        return _json_response({
             "status": "success",
-            "metadata": {
-                "current_page": page,
-                "per_page": per_page,
-                "total_count": total_count,
-                "total_pages": total_pages
-            },
+            "metadata": metadata,
             "data": users_data
         })
 
+    except ValueError as e:
+        return _json_response({
+            "status": "error",
+            "message": str(e)
+        }, status=400)
+
     except Exception as e:
-        return jsonify({
+        return _json_response({
             "status": "error",
             "message": str(e)
-        }), 500
+        }, status=500)
 
 if __name__ == '__main__':
     logger = get_logger(
@@ -59,10 +120,15 @@ if __name__ == '__main__':
     )
 
     try:
-        run_migrations()
+        # Migrations and seed data run only when asked for, not on every server (worker) start
+        init_db = os.environ.get("INIT_DB") == "1"
+        if init_db:
+            run_migrations()
 
         test_app.alembic_setup()
-        test_app.populate_users_in_db(count=100)
+        Session.configure(bind=test_app.engine)
+        if init_db:
+            test_app.populate_users_in_db(count=100)
 
         app.run(host='0.0.0.0', port=5000)
 
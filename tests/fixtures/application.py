@@ -1,9 +1,16 @@
 """Contain fixtures to fill application db"""
 import factory
 from factory import Faker as FactoryFaker
+import faker
 import random
 from models.application import Users
 
+# Upper bound of distinct values generated per Faker field in a batch
+FAKER_POOL_SIZE = 1000
+
+# Generates the batch value pools directly instead of going through factory internals
+_FAKER = faker.Faker()
+
 class UserFactory(factory.Factory):
     class Meta:
         model = Users
@@ -18,5 +25,32 @@ class UserFactory(factory.Factory):
     city = FactoryFaker('city')
     state = FactoryFaker('state')
     postcode = FactoryFaker('postcode')
-    active = factory.LazyFunction(lambda: random.choice(['Y', 'N']))
-    admin = factory.LazyFunction(lambda: 'Y' if random.random() > 0.95 else 'N')
\ No newline at end of file
+    active = factory.LazyFunction(lambda: 'YN'[random.getrandbits(1)])
+    admin = factory.LazyFunction(lambda: 'Y' if random.random() > 0.95 else 'N')
+
+    @classmethod
+    def build_dict(cls, **kwargs):
+        """Build a dict of column values without instantiating the model"""
+        return vars(cls.stub(**kwargs))
+
+    @classmethod
+    def build_batch_dicts(cls, size, pool_size=FAKER_POOL_SIZE):
+        """Build a list of ``size`` user dicts.
+
+        Faker is called at most ``pool_size`` times per field and rows pick their
+        values from these pools, so generating large batches stays cheap.
+        """
+        pool_size = min(size, pool_size)
+        providers = [
+            (name, getattr(_FAKER, getattr(cls, name).provider))
+            for name in dir(cls)
+            if isinstance(getattr(cls, name), FactoryFaker)
+        ]
+        pools = [
+            (name, [provider() for _ in range(pool_size)])
+            for name, provider in providers
+        ]
+        return [
+            cls.build_dict(**{name: random.choice(pool) for name, pool in pools})
+            for _ in range(size)
+        ]
\ No newline at end of file
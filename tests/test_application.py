@@ -0,0 +1,30 @@
+"""Tests for users queries"""
+import json
+import unittest
+
+import server
+from queries.application import get_active_users_keyset, get_users_keyset
+
+
+def _unused_session_factory():
+    raise AssertionError("No session should be opened for an invalid page size")
+
+
+class UsersKeysetTestCase(unittest.TestCase):
+
+    def test_rejects_page_size_below_one(self):
+        for per_page in (0, -1):
+            with self.assertRaises(ValueError):
+                get_users_keyset(_unused_session_factory, per_page=per_page)
+            with self.assertRaises(ValueError):
+                get_active_users_keyset(_unused_session_factory, after_userid="user_1", per_page=per_page)
+
+    def test_route_returns_bad_request_for_page_size_below_one(self):
+        client = server.app.test_client()
+        response = client.get('/active-users?cursor=&per_page=0')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(json.loads(response.get_data(as_text=True))["status"], "error")
+
+
+if __name__ == '__main__':
+    unittest.main()